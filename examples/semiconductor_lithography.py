@@ -3,9 +3,12 @@
 展示量子預火光源在光刻機中的應用
 """
 
+import math
 import time
 import threading
-from typing import Dict, List
+import numpy as np
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from typing import Dict, List, Optional
 from src.core.light_source_controller import (
     QuantumLightSourceController, 
     LightSourceConfig, 
@@ -13,6 +16,7 @@ from src.core.light_source_controller import (
     LightSourceState
 )
 from src.adapters.device_adapters import DeviceManager, EthernetAdapter
+from src.core._exposure_kernels import analyze_ticks
 
 class SemiconductorLithographySystem:
     """
@@ -39,8 +43,12 @@ class SemiconductorLithographySystem:
         # 生產狀態
         self.production_state = "IDLE"
         self.current_recipe = None
+        self._exposure_params = None
         self.wafer_count = 0
         
+        # 緊急停止事件 (曝光等待可立即中斷)
+        self._abort = threading.Event()
+        
         # 設置回調
         self._setup_callbacks()
     
@@ -67,6 +75,9 @@ class SemiconductorLithographySystem:
             if not self.light_source.calibrate():
                 return False
             
+            # 重新初始化後解除先前的緊急停止
+            self._abort.clear()
+            
             print("✅ 光刻系統初始化完成")
             self.production_state = "READY"
             return True
@@ -88,13 +99,24 @@ class SemiconductorLithographySystem:
         for device_id, adapter in devices.items():
             self.device_manager.register_device(device_id, adapter, {})
         
-        # 連接所有設備
-        connection_results = self.device_manager.connect_all()
+        # 並行連接所有設備 (各設備獨立，連接延遲互相重疊)
+        with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+            futures = {
+                executor.submit(self.device_manager.connect_one, device_id): device_id
+                for device_id in devices
+            }
+            completed = {futures[f]: f.result() for f in as_completed(futures)}
         
-        # 檢查連接結果
+        # 按註冊順序整理結果，保持日誌輸出順序穩定
+        connection_results = {device_id: completed[device_id] for device_id in devices}
+        
+        # 檢查連接結果 (失敗原因在匯合後按順序輸出)
         for device_id, connected in connection_results.items():
-            status = "✅" if connected else "❌"
-            print(f"{status} {device_id}: {'連接成功' if connected else '連接失敗'}")
+            if connected:
+                print(f"✅ {device_id}: 連接成功")
+            else:
+                error = getattr(devices[device_id], "last_error", None)
+                print(f"❌ {device_id}: 連接失敗" + (f" ({error})" if error else ""))
         
         return all(connection_results.values())
     
@@ -106,7 +128,19 @@ class SemiconductorLithographySystem:
         if not self._validate_recipe(recipe):
             return False
         
+        # 發射參數在加載時構造並驗證一次，所有晶圓曝光復用
+        try:
+            exposure_params = self._get_exposure_parameters(recipe)
+        except ValueError as e:
+            print(f"❌ 配方光源參數無效: {e}")
+            return False
+        
+        if exposure_params.power > self.light_source_config.max_power:
+            print(f"❌ 配方功率超出光源上限: {exposure_params.power:.3e}W")
+            return False
+        
         self.current_recipe = recipe
+        self._exposure_params = exposure_params
         
         # 配置光源參數
         light_params = recipe.get("light_source", {})
@@ -117,28 +151,59 @@ class SemiconductorLithographySystem:
     
     def start_exposure(self, wafer_id: str) -> bool:
         """開始晶圓曝光"""
+        return self._run_exposure(wafer_id)
+    
+    def _prepare_exposure(self, wafer_id: str):
+        """準備曝光 - 移動晶圓到曝光位置"""
+        self._move_wafer_to_position(wafer_id)
+    
+    def _can_prepare_exposure(self) -> bool:
+        """檢查是否允許移動工作台預定位晶圓"""
+        return (self.production_state == "READY"
+                and bool(self.current_recipe)
+                and not self._abort.is_set())
+    
+    def _discard_prepared(self, prepared: Optional[Future]):
+        """取消或等待未使用的預定位任務，確保其異常不被靜默丟棄"""
+        if prepared is None or prepared.cancel():
+            return
+        try:
+            prepared.result()
+        except Exception as e:
+            print(f"❌ 晶圓預定位出錯: {e}")
+    
+    def _run_exposure(self, wafer_id: str, prepared: Optional[Future] = None) -> bool:
+        """執行晶圓曝光，prepared 為已提交的預定位任務"""
         if self.production_state != "READY":
             print("❌ 系統未就緒，無法開始曝光")
+            self._discard_prepared(prepared)
             return False
         
         if not self.current_recipe:
             print("❌ 未加載光刻配方")
+            self._discard_prepared(prepared)
             return False
         
         print(f"🚀 開始晶圓曝光: {wafer_id}")
         self.production_state = "EXPOSING"
         
         try:
-            # 1. 移動晶圓到曝光位置
-            self._move_wafer_to_position(wafer_id)
+            # 1. 移動晶圓到曝光位置 (或等待預定位完成)
+            if prepared is None:
+                self._prepare_exposure(wafer_id)
+            else:
+                prepared.result()
             
             # 2. 啟動光源發射
-            exposure_params = self._get_exposure_parameters()
-            if not self.light_source.start_emission(exposure_params):
+            if not self.light_source.start_emission(self._exposure_params):
                 return False
             
             # 3. 執行曝光序列
-            self._execute_exposure_sequence()
+            if not self._execute_exposure_sequence():
+                self.light_source.stop_emission()
+                self.production_state = "EMERGENCY"
+                print(f"🛑 曝光已中止: {wafer_id}")
+                return False
             
             # 4. 停止曝光
             self.light_source.stop_emission()
@@ -168,31 +233,51 @@ class SemiconductorLithographySystem:
             "details": []
         }
         
-        for i, wafer_id in enumerate(wafer_list, 1):
-            print(f"\n--- 處理進度: {i}/{len(wafer_list)} ---")
+        # 雙緩衝流水線: 當前晶圓曝光時預定位下一片晶圓
+        with ThreadPoolExecutor(max_workers=1) as prep_pool:
+            prepared = None
+            if wafer_list and self._can_prepare_exposure():
+                prepared = prep_pool.submit(self._prepare_exposure, wafer_list[0])
             
-            start_time = time.time()
-            success = self.start_exposure(wafer_id)
-            process_time = time.time() - start_time
-            
-            result = {
-                "wafer_id": wafer_id,
-                "success": success,
-                "process_time": process_time,
-                "timestamp": time.time()
-            }
-            
-            if success:
-                results["success"] += 1
-            else:
-                results["failed"] += 1
-            
-            results["details"].append(result)
-            
-            # 每處理5個晶圓執行一次快速校準
-            if i % 5 == 0 and i < len(wafer_list):
-                print("🛠 執行快速校準...")
-                self.light_source.calibrate()
+            for i, wafer_id in enumerate(wafer_list, 1):
+                print(f"\n--- 處理進度: {i}/{len(wafer_list)} ---")
+                
+                current = prepared
+                prepared = None
+                if i < len(wafer_list) and self._can_prepare_exposure():
+                    prepared = prep_pool.submit(self._prepare_exposure, wafer_list[i])
+                
+                start_time = time.monotonic()
+                success = self._run_exposure(wafer_id, current)
+                process_time = time.monotonic() - start_time
+                
+                result = {
+                    "wafer_id": wafer_id,
+                    "success": success,
+                    "process_time": process_time,
+                    "timestamp": time.time()
+                }
+                
+                if success:
+                    results["success"] += 1
+                else:
+                    results["failed"] += 1
+                
+                results["details"].append(result)
+                
+                # 曝光失敗時停止流水線，不再移動後續晶圓
+                if not success:
+                    self._discard_prepared(prepared)
+                    skipped = len(wafer_list) - i
+                    if skipped:
+                        print(f"⏹ 停止批量處理，剩餘 {skipped} 個晶圓未處理")
+                        results["failed"] += skipped
+                    break
+                
+                # 每處理5個晶圓執行一次快速校準
+                if i % 5 == 0 and i < len(wafer_list):
+                    print("🛠 執行快速校準...")
+                    self.light_source.calibrate()
         
         print(f"\n🎉 批量處理完成: {results['success']} 成功, {results['failed']} 失敗")
         return results
@@ -201,6 +286,9 @@ class SemiconductorLithographySystem:
         """緊急停止"""
         print("🛑 執行緊急停止!")
         
+        # 喚醒曝光等待，立即退出曝光序列
+        self._abort.set()
+        
         # 立即停止光源
         self.light_source.stop_emission()
         
@@ -249,46 +337,71 @@ class SemiconductorLithographySystem:
         # 實際實現會控制工作台設備
         time.sleep(0.5)  # 模擬移動時間
     
-    def _get_exposure_parameters(self) -> EmissionParameters:
-        """獲取曝光參數"""
-        recipe_light = self.current_recipe.get("light_source", {})
+    def _get_exposure_parameters(self, recipe: Dict) -> EmissionParameters:
+        """由配方構造曝光參數 (參數無效時拋出ValueError)"""
+        recipe_light = recipe.get("light_source", {})
         
         return EmissionParameters(
             power=recipe_light.get("power", 3.0e-9),
-            duration=self.current_recipe.get("exposure_time", 10.0),
+            duration=recipe.get("exposure_time", 10.0),
             frequency=recipe_light.get("frequency", 1000),
             duty_cycle=recipe_light.get("duty_cycle", 0.5)
         )
     
-    def _execute_exposure_sequence(self):
-        """執行曝光序列"""
+    def _execute_exposure_sequence(self) -> bool:
+        """執行曝光序列，返回是否完整曝光 (緊急停止時為False)"""
         exposure_time = self.current_recipe.get("exposure_time", 10.0)
         
         print(f"⏱ 開始曝光，時長: {exposure_time}秒")
         
-        # 模擬曝光過程
-        start_time = time.time()
-        while time.time() - start_time < exposure_time:
-            elapsed = time.time() - start_time
-            progress = min(elapsed / exposure_time, 1.0)
+        # 按預先計算的節拍時間點等待，避免累積漂移
+        interval = 0.1
+        n_ticks = math.ceil(round(exposure_time / interval, 9))
+        report_every = max(1, n_ticks // 5)  # 每20%進度報告一次
+        
+        # 預分配節拍採樣數組，按報告窗口批量分析
+        # 最後一個節拍截止於曝光時長，保證完整曝光時間
+        times = np.minimum(np.arange(1, n_ticks + 1) * interval, exposure_time)
+        powers = np.empty(n_ticks)
+        stability = np.empty(n_ticks)
+        window_start = 0
+        
+        # 使用單調時鐘，避免系統時間跳變破壞曝光計時
+        start_time = time.monotonic()
+        for tick in range(1, n_ticks + 1):
+            deadline = start_time + times[tick - 1]
+            if self._abort.wait(max(0.0, deadline - time.monotonic())):
+                return False
             
-            # 實時監控和調整
-            self._monitor_exposure_progress(progress, elapsed)
+            # 採樣光源功率和穩定性 (只讀取分析所需的指標)
+            powers[tick - 1] = self.light_source.current_power
+            stability[tick - 1] = self.light_source.monitor.get_current_metrics().get('stability', 1.0)
             
-            time.sleep(0.1)  # 控制循環頻率
+            # 實時監控和調整
+            if tick % report_every == 0 or tick == n_ticks:
+                adjust = analyze_ticks(
+                    times[window_start:tick],
+                    powers[window_start:tick],
+                    stability[window_start:tick],
+                    0.99
+                )
+                window_start = tick
+                
+                elapsed = times[tick - 1]
+                progress = min(elapsed / exposure_time, 1.0)
+                self._monitor_exposure_progress(progress, elapsed, bool(adjust.any()))
+        
+        return True
     
-    def _monitor_exposure_progress(self, progress: float, elapsed: float):
+    def _monitor_exposure_progress(self, progress: float, elapsed: float,
+                                   needs_adjustment: bool = False):
         """監控曝光進度"""
-        if progress % 0.2 < 0.01:  # 每20%進度報告一次
-            print(f"📊 曝光進度: {progress*100:.1f}% ({elapsed:.1f}s)")
-            
-            # 檢查光源穩定性
-            status = self.light_source.get_status()
-            stability = status['performance_metrics'].get('stability', 1.0)
-            
-            if stability < 0.99:
-                print("⚠️  檢測到穩定性下降，進行微調...")
-                # 這裡可以觸發實時優化
+        print(f"📊 曝光進度: {progress*100:.1f}% ({elapsed:.1f}s)")
+        
+        # 檢查光源穩定性
+        if needs_adjustment:
+            print("⚠️  檢測到穩定性下降，進行微調...")
+            # 這裡可以觸發實時優化
     
     def _move_wafer_to_unload(self):
         """移動晶圓到卸載位置"""
@@ -6,12 +6,15 @@
 import abc
 import serial
 import socket
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
 
 class DeviceAdapter(abc.ABC):
     """設備適配器抽象基類"""
     
+    # 最近一次連接失敗的原因 (由子類在 connect 失敗時設置)
+    last_error: Optional[str] = None
+    
     @abc.abstractmethod
     def connect(self) -> bool:
         pass
@@ -37,6 +40,7 @@ class EthernetAdapter(DeviceAdapter):
         self.timeout = timeout
         self.socket = None
         self.connected = False
+        self.last_error = None
     
     def connect(self) -> bool:
         try:
@@ -44,9 +48,10 @@ class EthernetAdapter(DeviceAdapter):
             self.socket.settimeout(self.timeout)
             self.socket.connect((self.host, self.port))
             self.connected = True
+            self.last_error = None
             return True
         except Exception as e:
-            print(f"以太網連接失敗: {e}")
+            self.last_error = f"以太網連接失敗: {e}"
             return False
     
     def disconnect(self):
@@ -88,6 +93,7 @@ class SerialAdapter(DeviceAdapter):
         self.baudrate = baudrate
         self.serial = None
         self.connected = False
+        self.last_error = None
     
     def connect(self) -> bool:
         try:
@@ -97,9 +103,10 @@ class SerialAdapter(DeviceAdapter):
                 timeout=1.0
             )
             self.connected = True
+            self.last_error = None
             return True
         except Exception as e:
-            print(f"串口連接失敗: {e}")
+            self.last_error = f"串口連接失敗: {e}"
             return False
     
     def disconnect(self):
@@ -133,6 +140,7 @@ class ModbusTCPAdapter(DeviceAdapter):
         self.host = host
         self.port = port
         self.connected = False
+        self.last_error = None
     
     def connect(self) -> bool:
         # 實際實現會使用pymodbus等庫
@@ -165,11 +173,20 @@ class DeviceManager:
         self.adapters[device_id] = adapter
         self.device_configs[device_id] = config
     
+    def connect_one(self, device_id: str) -> bool:
+        """連接指定設備 (失敗原因記錄在適配器的 last_error 中，不直接輸出)"""
+        if device_id not in self.adapters:
+            return False
+        return self.adapters[device_id].connect()
+    
     def connect_all(self) -> Dict[str, bool]:
         """連接所有設備"""
         results = {}
         for device_id, adapter in self.adapters.items():
             results[device_id] = adapter.connect()
+            error = getattr(adapter, "last_error", None)
+            if not results[device_id] and error:
+                print(error)
         return results
     
     def send_to_device(self, device_id: str, command: str, params: Dict) -> Dict:
@@ -0,0 +1,57 @@
+"""
+曝光監控計算核心
+將逐節拍的穩定性分析批量化，可用時以Numba編譯為機器碼
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba為可選依賴，缺失時退回純Python實現
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+
+@njit("boolean[:](float64[:], float64[:], float64[:], float64)",
+      cache=True, fastmath=True)
+def analyze_ticks(times, powers, stab, threshold):
+    """
+    分析一段曝光節拍，返回需要微調的節拍掩碼
+
+    觸發條件:
+    - 穩定性低於閾值
+    - 按穩定性變化率 (斜率 × 節拍間隔) 外推到下一節拍將低於閾值
+    - 功率相對窗口均值的偏差超過 (1 - threshold)
+    """
+    n = times.shape[0]
+    mask = np.zeros(n, dtype=np.bool_)
+    if n == 0:
+        return mask
+
+    mean_power = 0.0
+    for i in range(n):
+        mean_power += powers[i]
+    mean_power /= n
+    tolerance = 1.0 - threshold
+
+    for i in range(n):
+        if stab[i] < threshold:
+            mask[i] = True
+            continue
+
+        if i > 0:
+            dt = times[i] - times[i - 1]
+            if dt > 0.0:
+                # 下一節拍間隔未知時沿用當前間隔
+                step = times[i + 1] - times[i] if i + 1 < n else dt
+                slope = (stab[i] - stab[i - 1]) / dt
+                if stab[i] + slope * step < threshold:
+                    mask[i] = True
+                    continue
+
+        if mean_power > 0.0 and abs(powers[i] - mean_power) / mean_power > tolerance:
+            mask[i] = True
+
+    return mask
@@ -6,18 +6,25 @@
 import numpy as np
 import time
 from typing import Dict, List, Optional, Callable
-from enum import Enum
+from enum import Enum, IntEnum
 from dataclasses import dataclass
 import logging
 
-class LightSourceState(Enum):
-    """光源狀態枚舉"""
-    OFF = "off"
-    STANDBY = "standby"
-    CALIBRATING = "calibrating"
-    READY = "ready"
-    EMITTING = "emitting"
-    ERROR = "error"
+class LightSourceState(IntEnum):
+    """光源狀態枚舉 (整數值，熱路徑上可直接做整數比較)"""
+    OFF = 0
+    STANDBY = 1
+    CALIBRATING = 2
+    READY = 3
+    EMITTING = 4
+    ERROR = 5
+
+# 狀態名稱，按 LightSourceState 整數值索引
+_STATE_NAMES = ("off", "standby", "calibrating", "ready", "emitting", "error")
+
+_OFF_ID = int(LightSourceState.OFF)
+_READY_ID = int(LightSourceState.READY)
+_EMITTING_ID = int(LightSourceState.EMITTING)
 
 class OutputMode(Enum):
     """輸出模式枚舉"""
@@ -35,13 +42,26 @@ class LightSourceConfig:
     warmup_time: float = 30.0   # 預熱時間 (秒)
     calibration_interval: int = 3600  # 校準間隔 (秒)
 
-@dataclass
+@dataclass(frozen=True)
 class EmissionParameters:
-    """發射參數"""
+    """發射參數 (構造時驗證，之後不可變)"""
     power: float                # 輸出功率
     duration: float = 0.0       # 發射時長 (0=持續)
     frequency: float = 0.0      # 脈衝頻率 (Hz)
     duty_cycle: float = 1.0     # 佔空比
+    
+    def __post_init__(self):
+        if self.power <= 0:
+            raise ValueError(f"無效的功率值: {self.power}")
+        
+        if self.duration < 0:
+            raise ValueError("發射時長不能為負")
+        
+        if self.frequency < 0:
+            raise ValueError("頻率不能為負")
+        
+        if self.duty_cycle <= 0 or self.duty_cycle > 1:
+            raise ValueError("佔空比必須在0-1之間")
 
 class QuantumLightSourceController:
     """
@@ -51,20 +71,38 @@ class QuantumLightSourceController:
     
     def __init__(self, config: LightSourceConfig):
         self.config = config
-        self.state = LightSourceState.OFF
+        self._state_id = int(LightSourceState.OFF)
+        self._state_str = _STATE_NAMES[self._state_id]
         self.current_power = 0.0
         self.operating_time = 0.0
         self.performance_metrics = {}
+        # 回調以元組存儲 (寫時複製)，觸發時無需複製或分配
         self._callbacks = {
-            'state_change': [],
-            'power_update': [],
-            'error': []
+            'state_change': (),
+            'power_update': (),
+            'error': ()
         }
         
         # 初始化子系統
         self._initialize_subsystems()
         
-        logging.info(f"量子光源控制器初始化完成 - 目標波長: {config.wavelength*1e9:.1f}nm")
+        # 預熱計劃: (目標功率, 持續時間) - 由配置推導，只計算一次
+        self._warmup_plan = tuple(
+            (config.max_power * power_ratio, duration)
+            for power_ratio, duration in (
+                (0.1, 5),   # 10% 功率, 5秒
+                (0.3, 10),  # 30% 功率, 10秒
+                (0.6, 10),  # 60% 功率, 10秒
+                (0.8, 5),   # 80% 功率, 5秒
+            )
+        )
+        
+        logging.info("量子光源控制器初始化完成 - 目標波長: %.1fnm", config.wavelength*1e9)
+    
+    @property
+    def state(self) -> LightSourceState:
+        """當前光源狀態 (只讀，由 _update_state 更新)"""
+        return LightSourceState(self._state_id)
     
     def _initialize_subsystems(self):
         """初始化子系統"""
@@ -88,7 +126,7 @@ class QuantumLightSourceController:
     
     def power_on(self) -> bool:
         """開啟光源"""
-        if self.state != LightSourceState.OFF:
+        if self._state_id != _OFF_ID:
             logging.warning("光源已經開啟")
             return False
             
@@ -108,7 +146,7 @@ class QuantumLightSourceController:
             return True
             
         except Exception as e:
-            logging.error(f"光源啟動失敗: {e}")
+            logging.error("光源啟動失敗: %s", e)
             self._update_state(LightSourceState.ERROR)
             return False
     
@@ -127,7 +165,7 @@ class QuantumLightSourceController:
     
     def start_emission(self, params: EmissionParameters) -> bool:
         """開始光發射"""
-        if self.state != LightSourceState.READY:
+        if self._state_id != _READY_ID:
             logging.error("光源未就緒，無法發射")
             return False
         
@@ -143,7 +181,8 @@ class QuantumLightSourceController:
             self._update_state(LightSourceState.EMITTING)
             self.current_power = params.power
             
-            logging.info(f"開始光發射 - 功率: {params.power:.3e}W, 模式: {params.duration if params.duration > 0 else '連續'}")
+            logging.info("開始光發射 - 功率: %.3eW, 模式: %s",
+                         params.power, params.duration if params.duration > 0 else '連續')
             
             # 啟動功率監控
             self.monitor.start_power_monitoring()
@@ -151,12 +190,12 @@ class QuantumLightSourceController:
             return True
             
         except Exception as e:
-            logging.error(f"啟動光發射失敗: {e}")
+            logging.error("啟動光發射失敗: %s", e)
             return False
     
     def stop_emission(self):
         """停止光發射"""
-        if self.state == LightSourceState.EMITTING:
+        if self._state_id == _EMITTING_ID:
             logging.info("停止光發射...")
             
             self.optimizer.stop_real_time_optimization()
@@ -170,10 +209,10 @@ class QuantumLightSourceController:
     def set_power(self, power: float) -> bool:
         """設置輸出功率"""
         if power < 0 or power > self.config.max_power:
-            logging.error(f"功率超出範圍: {power:.3e}W (最大: {self.config.max_power:.3e}W)")
+            logging.error("功率超出範圍: %.3eW (最大: %.3eW)", power, self.config.max_power)
             return False
         
-        if self.state != LightSourceState.EMITTING:
+        if self._state_id != _EMITTING_ID:
             logging.error("光源未在發射狀態，無法調整功率")
             return False
         
@@ -183,11 +222,11 @@ class QuantumLightSourceController:
             if success:
                 self.current_power = power
                 self._trigger_callbacks('power_update', power)
-                logging.info(f"功率調整完成: {power:.3e}W")
+                logging.info("功率調整完成: %.3eW", power)
             return success
             
         except Exception as e:
-            logging.error(f"功率調整失敗: {e}")
+            logging.error("功率調整失敗: %s", e)
             return False
     
     def calibrate(self) -> bool:
@@ -214,14 +253,14 @@ class QuantumLightSourceController:
                 return False
                 
         except Exception as e:
-            logging.error(f"校準過程出錯: {e}")
+            logging.error("校準過程出錯: %s", e)
             self._update_state(LightSourceState.ERROR)
             return False
     
     def get_status(self) -> Dict:
         """獲取系統狀態"""
         return {
-            'state': self.state.value,
+            'state': self._state_str,
             'current_power': self.current_power,
             'operating_time': self.operating_time,
             'wavelength': self.config.wavelength,
@@ -236,38 +275,21 @@ class QuantumLightSourceController:
     def register_callback(self, event: str, callback: Callable):
         """註冊回調函數"""
         if event in self._callbacks:
-            self._callbacks[event].append(callback)
+            self._callbacks[event] = self._callbacks[event] + (callback,)
     
     def _execute_warmup_sequence(self):
         """執行預熱序列"""
         logging.info("執行預熱序列...")
         
         # 逐步增加系統參數
-        warmup_steps = [
-            (0.1, 5),   # 10% 功率, 5秒
-            (0.3, 10),  # 30% 功率, 10秒
-            (0.6, 10),  # 60% 功率, 10秒
-            (0.8, 5),   # 80% 功率, 5秒
-        ]
-        
-        for power_ratio, duration in warmup_steps:
-            target_power = self.config.max_power * power_ratio
+        for target_power, duration in self._warmup_plan:
             self.optimizer.prepare_for_power(target_power)
             time.sleep(duration)
     
     def _validate_emission_parameters(self, params: EmissionParameters):
-        """驗證發射參數"""
-        if params.power <= 0 or params.power > self.config.max_power:
+        """驗證發射參數 (其餘字段已在 EmissionParameters 構造時驗證)"""
+        if params.power > self.config.max_power:
             raise ValueError(f"無效的功率值: {params.power}")
-        
-        if params.duration < 0:
-            raise ValueError("發射時長不能為負")
-        
-        if params.frequency < 0:
-            raise ValueError("頻率不能為負")
-        
-        if params.duty_cycle <= 0 or params.duty_cycle > 1:
-            raise ValueError("佔空比必須在0-1之間")
     
     def _apply_emission_parameters(self, params: EmissionParameters):
         """應用發射參數到子系統"""
@@ -282,23 +304,27 @@ class QuantumLightSourceController:
     
     def _update_state(self, new_state: LightSourceState):
         """更新狀態並觸發回調"""
-        old_state = self.state
-        self.state = new_state
+        old_state_str = self._state_str
+        self._state_id = int(new_state)
+        self._state_str = _STATE_NAMES[self._state_id]
         
         # 觸發狀態變化回調
         self._trigger_callbacks('state_change', {
-            'old_state': old_state.value,
-            'new_state': new_state.value,
+            'old_state': old_state_str,
+            'new_state': self._state_str,
             'timestamp': time.time()
         })
     
     def _trigger_callbacks(self, event: str, data):
         """觸發回調函數"""
-        for callback in self._callbacks.get(event, []):
+        callbacks = self._callbacks.get(event)
+        if not callbacks:
+            return
+        for callback in callbacks:
             try:
                 callback(data)
-            except Exception as e:
-                logging.error(f"回調函數執行失敗: {e}")
+            except Exception:
+                logging.exception("回調函數執行失敗: %s", event)
 
 # 子系統實現 (簡化版本)
 class QuantumJetSubsystem:
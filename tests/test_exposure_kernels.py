@@ -0,0 +1,76 @@
+import importlib
+import sys
+import numpy as np
+import pytest
+import src.core._exposure_kernels as exposure_kernels
+
+TICK = 0.1
+
+def _window(stab, powers=None):
+    n = len(stab)
+    times = np.arange(1, n + 1) * TICK
+    if powers is None:
+        powers = np.full(n, 3.0e-9)
+    return times, np.asarray(powers, dtype=np.float64), np.asarray(stab, dtype=np.float64)
+
+@pytest.fixture
+def pure_python_kernels(monkeypatch):
+    """無Numba環境下重新加載的計算核心"""
+    monkeypatch.setitem(sys.modules, "numba", None)
+    module = importlib.reload(exposure_kernels)
+    yield module
+    monkeypatch.undo()
+    importlib.reload(exposure_kernels)
+
+@pytest.fixture(params=["default", "pure_python"])
+def analyze_ticks(request):
+    if request.param == "pure_python":
+        return request.getfixturevalue("pure_python_kernels").analyze_ticks
+    return exposure_kernels.analyze_ticks
+
+class TestAnalyzeTicks:
+    """曝光節拍分析核心測試"""
+    
+    def test_stable_window_needs_no_adjustment(self, analyze_ticks):
+        """測試穩定窗口不觸發微調"""
+        mask = analyze_ticks(*_window([0.999] * 5), 0.99)
+        assert mask.dtype == np.bool_
+        assert not mask.any()
+    
+    def test_stability_below_threshold(self, analyze_ticks):
+        """測試穩定性低於閾值"""
+        mask = analyze_ticks(*_window([0.999, 0.985, 0.999]), 0.99)
+        assert mask.tolist() == [False, True, False]
+    
+    def test_trend_projection(self, analyze_ticks):
+        """測試按下降趨勢外推觸發微調"""
+        # 0.998 -> 0.994: 斜率 -0.04/s，下一節拍外推到 0.990 以下
+        mask = analyze_ticks(*_window([0.998, 0.9935]), 0.99)
+        assert mask.tolist() == [False, True]
+    
+    def test_trend_projection_uses_tick_interval(self, analyze_ticks):
+        """測試外推使用節拍間隔而非固定步長"""
+        times = np.array([0.1, 0.2, 0.25])
+        powers = np.full(3, 3.0e-9)
+        stab = np.array([0.999, 0.994, 0.9935])
+        # 第二個節拍: 斜率 -0.05/s，下一間隔 0.05s 外推到 0.9915，不觸發
+        # (若按 0.1s 外推則為 0.989，會誤觸發)
+        mask = analyze_ticks(times, powers, stab, 0.99)
+        assert mask.tolist() == [False, False, False]
+    
+    def test_power_deviation(self, analyze_ticks):
+        """測試功率偏離窗口均值"""
+        powers = [3.0e-9] * 20
+        powers[10] = 3.3e-9
+        mask = analyze_ticks(*_window([0.999] * 20, powers), 0.99)
+        assert np.flatnonzero(mask).tolist() == [10]
+    
+    def test_empty_window(self, analyze_ticks):
+        """測試空窗口"""
+        empty = np.empty(0)
+        mask = analyze_ticks(empty, empty, empty, 0.99)
+        assert mask.shape == (0,)
+    
+    def test_fallback_without_numba(self, pure_python_kernels):
+        """測試缺少Numba時退回純Python函數"""
+        assert not hasattr(pure_python_kernels.analyze_ticks, "signatures")
@@ -0,0 +1,143 @@
+import dataclasses
+import logging
+import pytest
+from src.core.light_source_controller import (
+    QuantumLightSourceController,
+    LightSourceConfig,
+    LightSourceState,
+    EmissionParameters
+)
+
+@pytest.fixture
+def controller():
+    return QuantumLightSourceController(LightSourceConfig())
+
+class TestCallbacks:
+    """回調註冊與觸發測試"""
+    
+    def test_callbacks_dispatched_in_registration_order(self, controller):
+        """測試回調按註冊順序觸發"""
+        calls = []
+        controller.register_callback('power_update', lambda data: calls.append(('a', data)))
+        controller.register_callback('power_update', lambda data: calls.append(('b', data)))
+        
+        controller._trigger_callbacks('power_update', 1.0e-9)
+        
+        assert calls == [('a', 1.0e-9), ('b', 1.0e-9)]
+    
+    def test_unknown_event_ignored(self, controller):
+        """測試未知事件不註冊也不報錯"""
+        controller.register_callback('unknown', lambda data: None)
+        
+        assert 'unknown' not in controller._callbacks
+        controller._trigger_callbacks('unknown', None)
+    
+    def test_failing_callback_does_not_block_others(self, controller, caplog):
+        """測試單個回調失敗不影響其他回調"""
+        calls = []
+        
+        def failing(data):
+            raise RuntimeError("boom")
+        
+        controller.register_callback('error', failing)
+        controller.register_callback('error', calls.append)
+        
+        with caplog.at_level(logging.ERROR):
+            controller._trigger_callbacks('error', {'code': 1})
+        
+        assert calls == [{'code': 1}]
+        assert "回調函數執行失敗" in caplog.text
+    
+    def test_register_during_dispatch_applies_to_next_event(self, controller):
+        """測試觸發過程中註冊的回調只在下次事件生效"""
+        calls = []
+        
+        def register_more(data):
+            calls.append('first')
+            controller.register_callback('state_change', lambda d: calls.append('late'))
+        
+        controller.register_callback('state_change', register_more)
+        controller._trigger_callbacks('state_change', {})
+        
+        assert calls == ['first']
+        
+        calls.clear()
+        controller._trigger_callbacks('state_change', {})
+        assert calls == ['first', 'late']
+
+class TestStatus:
+    """狀態查詢測試"""
+    
+    def test_snapshot_not_changed_by_later_state(self, controller):
+        """測試已返回的快照不隨狀態變化"""
+        snapshot = controller.get_status()
+        assert snapshot['state'] == 'off'
+        
+        controller._update_state(LightSourceState.READY)
+        
+        assert controller.get_status()['state'] == 'ready'
+        assert snapshot['state'] == 'off'
+    
+    def test_status_reports_current_power(self, controller):
+        """測試狀態返回最新功率"""
+        controller.get_status()
+        controller.current_power = 2.0e-9
+        
+        assert controller.get_status()['current_power'] == 2.0e-9
+    
+    def test_subsystem_status_is_fresh(self, controller, monkeypatch):
+        """測試每次查詢都返回最新的子系統狀態"""
+        controller.get_status()
+        monkeypatch.setattr(controller.monitor, "get_current_metrics",
+                            lambda: {"stability": 0.95})
+        
+        assert controller.get_status()['performance_metrics']['stability'] == 0.95
+
+class TestEmissionParameters:
+    """發射參數驗證測試"""
+    
+    @pytest.mark.parametrize("kwargs", [
+        {"power": 0.0},
+        {"power": -1.0e-9},
+        {"power": 1.0e-9, "duration": -1.0},
+        {"power": 1.0e-9, "frequency": -1.0},
+        {"power": 1.0e-9, "duty_cycle": 0.0},
+        {"power": 1.0e-9, "duty_cycle": 1.5},
+    ])
+    def test_invalid_fields_rejected(self, kwargs):
+        """測試構造時拒絕無效字段"""
+        with pytest.raises(ValueError):
+            EmissionParameters(**kwargs)
+    
+    def test_parameters_are_frozen(self):
+        """測試發射參數不可修改"""
+        params = EmissionParameters(power=1.0e-9)
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            params.power = 2.0e-9
+    
+    def test_controller_rejects_power_above_max(self, controller):
+        """測試控制器拒絕超過最大功率的參數"""
+        controller._update_state(LightSourceState.READY)
+        params = EmissionParameters(power=controller.config.max_power * 2)
+        
+        assert not controller.start_emission(params)
+        assert controller.state == LightSourceState.READY
+
+class TestState:
+    """光源狀態測試"""
+    
+    def test_state_follows_transitions(self, controller):
+        """測試狀態屬性與狀態轉換一致"""
+        assert controller.state is LightSourceState.OFF
+        
+        controller._update_state(LightSourceState.EMITTING)
+        
+        assert controller.state is LightSourceState.EMITTING
+        assert controller.get_status()['state'] == 'emitting'
+    
+    def test_state_is_read_only(self, controller):
+        """測試狀態不能被直接賦值"""
+        with pytest.raises(AttributeError):
+            controller.state = LightSourceState.EMITTING
+        
+        assert controller.state is LightSourceState.OFF
@@ -0,0 +1,181 @@
+import threading
+import time
+import pytest
+from src.core.light_source_controller import LightSourceState
+from src.adapters.device_adapters import DeviceAdapter, DeviceManager
+from examples.semiconductor_lithography import SemiconductorLithographySystem
+
+@pytest.fixture
+def litho_system(monkeypatch):
+    """光刻系統 (跳過預熱與工作台移動的等待)"""
+    monkeypatch.setattr(time, "sleep", lambda seconds: None)
+    system = SemiconductorLithographySystem()
+    system._initialize_devices = lambda: True
+    assert system.initialize_system()
+    system.load_recipe({
+        "name": "測試配方",
+        "exposure_time": 0.3,
+        "light_source": {"power": 3.0e-9}
+    })
+    return system
+
+class TestExposureSequence:
+    """曝光序列測試"""
+    
+    def _record_progress(self, system):
+        reports = []
+        system._monitor_exposure_progress = (
+            lambda progress, elapsed, needs_adjustment=False: reports.append(elapsed)
+        )
+        return reports
+    
+    def test_exposure_runs_full_duration(self, litho_system):
+        """測試曝光時長不被截斷"""
+        reports = self._record_progress(litho_system)
+        
+        start = time.monotonic()
+        assert litho_system._execute_exposure_sequence()
+        
+        assert time.monotonic() - start >= 0.3
+        assert reports[-1] == pytest.approx(0.3)
+    
+    @pytest.mark.parametrize("exposure_time", [0.05, 0.25, 0.7])
+    def test_last_tick_clamped_to_exposure_time(self, litho_system, exposure_time):
+        """測試最後一個節拍截止於曝光時長"""
+        litho_system.current_recipe["exposure_time"] = exposure_time
+        reports = self._record_progress(litho_system)
+        
+        assert litho_system._execute_exposure_sequence()
+        assert reports[-1] == pytest.approx(exposure_time)
+    
+    def test_abort_exits_immediately(self, litho_system):
+        """測試緊急停止事件立即中斷曝光"""
+        litho_system.current_recipe["exposure_time"] = 10.0
+        litho_system._abort.set()
+        
+        start = time.monotonic()
+        assert not litho_system._execute_exposure_sequence()
+        assert time.monotonic() - start < 0.5
+    
+    def test_aborted_exposure_stops_emission(self, litho_system):
+        """測試中止的曝光關閉光源發射"""
+        litho_system._abort.set()
+        
+        assert not litho_system.start_exposure("Wafer_001")
+        assert litho_system.light_source.state == LightSourceState.READY
+        assert litho_system.production_state == "EMERGENCY"
+    
+    def test_reinitialize_clears_emergency_stop(self, litho_system):
+        """測試重新初始化後可恢復曝光"""
+        litho_system.emergency_stop()
+        litho_system.light_source.power_off()
+        
+        assert litho_system.initialize_system()
+        assert not litho_system._abort.is_set()
+        assert litho_system.start_exposure("Wafer_001")
+        assert litho_system.wafer_count == 1
+
+class TestBatchPipeline:
+    """批量處理流水線測試"""
+    
+    def _record_moves(self, system):
+        moves = []
+        system._move_wafer_to_position = moves.append
+        return moves
+    
+    def test_batch_processes_all_wafers(self, litho_system):
+        """測試批量處理每個晶圓恰好定位一次"""
+        litho_system.current_recipe["exposure_time"] = 0.1
+        moves = self._record_moves(litho_system)
+        wafers = ["Wafer_001", "Wafer_002", "Wafer_003"]
+        
+        results = litho_system.batch_process(wafers)
+        
+        assert results["success"] == 3
+        assert moves == wafers
+    
+    def test_no_stage_motion_when_not_ready(self, litho_system):
+        """測試系統未就緒時不移動工作台"""
+        litho_system.production_state = "IDLE"
+        moves = self._record_moves(litho_system)
+        
+        results = litho_system.batch_process(["Wafer_001", "Wafer_002", "Wafer_003"])
+        
+        assert moves == []
+        assert results["failed"] == 3
+    
+    def test_pipeline_stops_after_emergency_stop(self, litho_system):
+        """測試緊急停止後不再預定位後續晶圓"""
+        litho_system.current_recipe["exposure_time"] = 10.0
+        moves = self._record_moves(litho_system)
+        threading.Timer(0.2, litho_system.emergency_stop).start()
+        
+        results = litho_system.batch_process(["Wafer_001", "Wafer_002", "Wafer_003"])
+        
+        assert moves == ["Wafer_001", "Wafer_002"]
+        assert results["success"] == 0
+        assert results["failed"] == 3
+        assert litho_system.production_state == "EMERGENCY"
+    
+    def test_failed_prepare_is_reported(self, litho_system, capsys):
+        """測試預定位異常不被靜默丟棄"""
+        def failing_move(wafer_id):
+            raise RuntimeError("工作台故障")
+        
+        litho_system._move_wafer_to_position = failing_move
+        
+        results = litho_system.batch_process(["Wafer_001", "Wafer_002"])
+        
+        assert results["failed"] == 2
+        assert "工作台故障" in capsys.readouterr().out
+        assert litho_system.production_state == "ERROR"
+
+class TestDeviceConnection:
+    """設備連接測試"""
+    
+    def test_connect_all_with_custom_adapter(self):
+        """測試未設置 last_error 的自定義適配器連接失敗時返回False"""
+        class FailingAdapter(DeviceAdapter):
+            def connect(self): return False
+            def disconnect(self): pass
+            def send_command(self, command, parameters): return {}
+            def read_status(self): return {}
+        
+        manager = DeviceManager()
+        manager.register_device("custom", FailingAdapter(), {})
+        
+        assert manager.connect_all() == {"custom": False}
+        assert manager.connect_one("custom") is False
+
+class TestRecipeLoading:
+    """配方加載測試"""
+    
+    @pytest.mark.parametrize("light_source", [
+        {"power": 3.0e-9, "duty_cycle": 0},
+        {"power": -1.0e-9},
+        {"power": 1.0e-8},
+    ])
+    def test_invalid_recipe_rejected(self, litho_system, light_source):
+        """測試無效光源參數在加載時被拒絕，保留原配方"""
+        previous = litho_system.current_recipe
+        
+        assert not litho_system.load_recipe({
+            "name": "無效配方",
+            "exposure_time": 1.0,
+            "light_source": light_source
+        })
+        assert litho_system.current_recipe is previous
+    
+    def test_exposure_params_built_once_per_recipe(self, litho_system, monkeypatch):
+        """測試曝光參數只在加載配方時構造一次"""
+        litho_system.current_recipe["exposure_time"] = 0.1
+        built = []
+        original = litho_system._get_exposure_parameters
+        monkeypatch.setattr(litho_system, "_get_exposure_parameters",
+                            lambda recipe: built.append(recipe) or original(recipe))
+        
+        litho_system.load_recipe(dict(litho_system.current_recipe))
+        results = litho_system.batch_process(["Wafer_001", "Wafer_002"])
+        
+        assert results["success"] == 2
+        assert len(built) == 1